@@ -345,9 +345,11 @@ LOGIN_URL = "/login/"
 LOGOUT_REDIRECT_URL = "/login/"
 
 # Allauth settings
+# Both backends load UserSettings together with the user. Sessions store the
+# backend's import path, so changing these paths logs out every existing session.
 AUTHENTICATION_BACKENDS = [
-    "django.contrib.auth.backends.ModelBackend",  # Keep default
-    "allauth.account.auth_backends.AuthenticationBackend",
+    "apps.users.backends.ModelBackend",
+    "apps.users.backends.AuthenticationBackend",
 ]
 
 SOCIALACCOUNT_PROVIDERS = {"openid_connect": {"APPS": []}}
@@ -380,6 +382,7 @@ SOCIALACCOUNT_EMAIL_AUTHENTICATION = True
 SOCIALACCOUNT_EMAIL_AUTHENTICATION_AUTO_CONNECT = True
 ACCOUNT_ADAPTER = "allauth.account.adapter.DefaultAccountAdapter"
 SOCIALACCOUNT_ADAPTER = "apps.users.adapters.AutoConnectSocialAccountAdapter"
+OIDC_ONLY = os.getenv("OIDC_ONLY", "false").lower() == "true"
 
 # CRISPY FORMS
 CRISPY_ALLOWED_TEMPLATE_PACKS = [
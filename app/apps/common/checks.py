@@ -1,103 +1,110 @@
 """
-Django System Checks for required environment variables.
+Django System Checks for WYGIWYH's configuration.
 
-This module validates that required environment variables (those without defaults)
-are present before the application starts.
+This module validates the environment variables the application depends on
+(required variables, integer variables and the soft delete options) and the
+OIDC settings before the application starts.
 """
 
 import os
 
+from django.conf import settings
 from django.core.checks import Error, register
 
+# Snapshot of the environment, taken once when the checks are registered
+_ENV = dict(os.environ)
 
-# List of environment variables that are required (no default values)
+# Environment variables that are required (no default values), with descriptions
 # Based on the README.md documentation
-REQUIRED_ENV_VARS = [
+REQUIRED_ENV_VARS = (
     ("SECRET_KEY", "This is used to provide cryptographic signing."),
     ("SQL_DATABASE", "The name of your postgres database."),
-]
+)
 
-# List of environment variables that must be valid integers if set
-INT_ENV_VARS = [
+# Environment variables that must be valid integers if set, with descriptions
+INT_ENV_VARS = (
     ("TASK_WORKERS", "How many workers to have for async tasks."),
     ("SESSION_EXPIRY_TIME", "The age of session cookies, in seconds."),
     ("INTERNAL_PORT", "The port on which the app listens on."),
     ("DJANGO_VITE_DEV_SERVER_PORT", "The port where Vite's dev server is running"),
-]
+)
+
+
+def _is_missing(value):
+    return not value
+
+
+def _is_invalid_int(value):
+    if value is None:
+        return False
+    try:
+        int(value)
+    except ValueError:
+        return True
+    return False
+
+
+# (variable, validator, message, hint, error id) for every variable checked
+# unconditionally. Messages are built once; "{value}" is filled in on failure.
+_ENV_VAR_CHECKS = tuple(
+    (
+        var_name,
+        _is_missing,
+        f"Required environment variable '{var_name}' is not set.",
+        f"{description} Please set this variable in your .env file or environment.",
+        "wygiwyh.E001",
+    )
+    for var_name, description in REQUIRED_ENV_VARS
+) + tuple(
+    (
+        var_name,
+        _is_invalid_int,
+        f"Environment variable '{var_name}' must be a valid integer, got '{{value}}'.",
+        description,
+        "wygiwyh.E002",
+    )
+    for var_name, description in INT_ENV_VARS
+)
 
 
 @register()
-def check_required_env_vars(app_configs, **kwargs):
+def check_configuration(app_configs, **kwargs):
     """
-    Check that all required environment variables are set.
+    Check the environment variables and OIDC settings WYGIWYH depends on.
 
-    Returns a list of Error objects for any missing required variables.
+    Covers required variables, variables that must be integers, the soft delete
+    configuration and OIDC_ONLY. Returns a list of Error objects for any problems found.
     """
     errors = []
-
-    for var_name, description in REQUIRED_ENV_VARS:
-        value = os.getenv(var_name)
-        if not value:
-            errors.append(
+    env_get = _ENV.get
+    append = errors.append
+
+    for var_name, is_invalid, msg, hint, error_id in _ENV_VAR_CHECKS:
+        value = env_get(var_name)
+        if is_invalid(value):
+            append(Error(msg.format(value=value), hint=hint, id=error_id))
+
+    if env_get("ENABLE_SOFT_DELETE", "false").lower() == "true":
+        keep_deleted_for = env_get("KEEP_DELETED_TRANSACTIONS_FOR")
+        if _is_invalid_int(keep_deleted_for):
+            append(
                 Error(
-                    f"Required environment variable '{var_name}' is not set.",
-                    hint=f"{description} Please set this variable in your .env file or environment.",
-                    id="wygiwyh.E001",
+                    f"Environment variable 'KEEP_DELETED_TRANSACTIONS_FOR' must be a valid integer when ENABLE_SOFT_DELETE is enabled, got '{keep_deleted_for}'.",
+                    hint="Time in days to keep soft deleted transactions for. Set to 0 to keep all transactions indefinitely.",
+                    id="wygiwyh.E003",
                 )
             )
 
-    return errors
-
-
-@register()
-def check_int_env_vars(app_configs, **kwargs):
-    """
-    Check that environment variables that should be integers are valid.
-
-    Returns a list of Error objects for any invalid integer variables.
-    """
-    errors = []
-
-    for var_name, description in INT_ENV_VARS:
-        value = os.getenv(var_name)
-        if value is not None:
-            try:
-                int(value)
-            except ValueError:
-                errors.append(
-                    Error(
-                        f"Environment variable '{var_name}' must be a valid integer, got '{value}'.",
-                        hint=f"{description}",
-                        id="wygiwyh.E002",
-                    )
-                )
-
-    return errors
-
-
-@register()
-def check_soft_delete_config(app_configs, **kwargs):
-    """
-    Check that KEEP_DELETED_TRANSACTIONS_FOR is a valid integer when ENABLE_SOFT_DELETE is enabled.
-
-    Returns a list of Error objects if the configuration is invalid.
-    """
-    errors = []
-
-    enable_soft_delete = os.getenv("ENABLE_SOFT_DELETE", "false").lower() == "true"
-
-    if enable_soft_delete:
-        keep_deleted_for = os.getenv("KEEP_DELETED_TRANSACTIONS_FOR")
-        if keep_deleted_for is not None:
-            try:
-                int(keep_deleted_for)
-            except ValueError:
-                errors.append(
-                    Error(
-                        f"Environment variable 'KEEP_DELETED_TRANSACTIONS_FOR' must be a valid integer when ENABLE_SOFT_DELETE is enabled, got '{keep_deleted_for}'.",
-                        hint="Time in days to keep soft deleted transactions for. Set to 0 to keep all transactions indefinitely.",
-                        id="wygiwyh.E003",
-                    )
-                )
+    if (
+        settings.OIDC_ONLY
+        and not settings.SOCIALACCOUNT_PROVIDERS["openid_connect"]["APPS"]
+    ):
+        append(
+            Error(
+                "OIDC_ONLY is enabled but no OIDC provider is configured.",
+                hint="Set OIDC_CLIENT_ID, OIDC_CLIENT_SECRET and OIDC_SERVER_URL, or disable OIDC_ONLY.",
+                id="wygiwyh.E004",
+            )
+        )
 
     return errors
@@ -0,0 +1,78 @@
+from unittest.mock import patch
+
+from django.test import SimpleTestCase, override_settings
+
+from apps.common import checks
+
+NO_OIDC_PROVIDERS = {"openid_connect": {"APPS": []}}
+
+VALID_ENV = {
+    "SECRET_KEY": "secret",
+    "SQL_DATABASE": "wygiwyh",
+    "TASK_WORKERS": "1",
+}
+
+
+class CheckConfigurationTests(SimpleTestCase):
+    """Tests for the check_configuration system check"""
+
+    def run_check(self, env):
+        with patch.object(checks, "_ENV", env):
+            return checks.check_configuration(None)
+
+    @override_settings(OIDC_ONLY=False, SOCIALACCOUNT_PROVIDERS=NO_OIDC_PROVIDERS)
+    def test_valid_configuration_has_no_errors(self):
+        """Test a healthy environment produces no errors"""
+        self.assertEqual(self.run_check(VALID_ENV), [])
+
+    @override_settings(OIDC_ONLY=True, SOCIALACCOUNT_PROVIDERS=NO_OIDC_PROVIDERS)
+    def test_errors_are_emitted_in_order(self):
+        """Test every error is reported, in the E001-E004 order"""
+        env = {
+            "SECRET_KEY": "secret",
+            "TASK_WORKERS": "many",
+            "ENABLE_SOFT_DELETE": "true",
+            "KEEP_DELETED_TRANSACTIONS_FOR": "forever",
+        }
+
+        errors = self.run_check(env)
+
+        self.assertEqual(
+            [error.id for error in errors],
+            ["wygiwyh.E001", "wygiwyh.E002", "wygiwyh.E003", "wygiwyh.E004"],
+        )
+        self.assertEqual(
+            errors[0].msg, "Required environment variable 'SQL_DATABASE' is not set."
+        )
+        self.assertEqual(
+            errors[1].msg,
+            "Environment variable 'TASK_WORKERS' must be a valid integer, got 'many'.",
+        )
+        self.assertEqual(errors[1].hint, "How many workers to have for async tasks.")
+        self.assertIn("got 'forever'", errors[2].msg)
+
+    @override_settings(OIDC_ONLY=False, SOCIALACCOUNT_PROVIDERS=NO_OIDC_PROVIDERS)
+    def test_keep_deleted_ignored_without_soft_delete(self):
+        """Test KEEP_DELETED_TRANSACTIONS_FOR is only validated with soft delete on"""
+        env = {**VALID_ENV, "KEEP_DELETED_TRANSACTIONS_FOR": "forever"}
+        self.assertEqual(self.run_check(env), [])
+
+    @override_settings(
+        OIDC_ONLY=True,
+        SOCIALACCOUNT_PROVIDERS={
+            "openid_connect": {
+                "APPS": [
+                    {
+                        "provider_id": "test-idp",
+                        "name": "Test IdP",
+                        "client_id": "client-id",
+                        "secret": "client-secret",
+                        "settings": {"server_url": "https://idp.example.com"},
+                    }
+                ]
+            }
+        },
+    )
+    def test_oidc_only_with_provider_is_valid(self):
+        """Test OIDC_ONLY is accepted when a provider is configured"""
+        self.assertEqual(self.run_check(VALID_ENV), [])
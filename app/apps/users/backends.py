@@ -0,0 +1,32 @@
+from allauth.account.auth_backends import (
+    AuthenticationBackend as BaseAuthenticationBackend,
+)
+from django.contrib.auth import get_user_model
+from django.contrib.auth.backends import ModelBackend as BaseModelBackend
+
+
+class SelectRelatedSettingsMixin:
+    """
+    Load the user's settings in the same query as the user itself.
+
+    Nearly every request reads request.user.settings (LocalizationMiddleware,
+    the start page redirect, the toggles), so this saves one query per request.
+    """
+
+    def get_user(self, user_id):
+        UserModel = get_user_model()
+        try:
+            user = UserModel._default_manager.select_related("settings").get(
+                pk=user_id
+            )
+        except UserModel.DoesNotExist:
+            return None
+        return user if self.user_can_authenticate(user) else None
+
+
+class ModelBackend(SelectRelatedSettingsMixin, BaseModelBackend):
+    pass
+
+
+class AuthenticationBackend(SelectRelatedSettingsMixin, BaseAuthenticationBackend):
+    pass
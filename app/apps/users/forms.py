@@ -146,9 +146,11 @@ class UserSettingsForm(forms.ModelForm):
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
 
+        # Accounts are filtered per user, so this can't be cached across requests;
+        # select the group up front so TomSelect's group_by doesn't query per option
         self.fields["default_account"].queryset = Account.objects.filter(
             is_archived=False,
-        )
+        ).select_related("group")
 
         self.helper = FormHelper()
         self.helper.form_tag = False
@@ -0,0 +1,68 @@
+from allauth.account.adapter import get_adapter
+from allauth.account.auth_backends import (
+    AuthenticationBackend as AllauthAuthenticationBackend,
+)
+from django.contrib.auth import BACKEND_SESSION_KEY, get_backends, get_user_model
+from django.contrib.sessions.middleware import SessionMiddleware
+from django.db import connection
+from django.test import RequestFactory, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+
+
+@override_settings(
+    STORAGES={
+        "default": {"BACKEND": "django.core.files.storage.FileSystemStorage"},
+        "staticfiles": {"BACKEND": "django.contrib.staticfiles.storage.StaticFilesStorage"},
+    },
+    WHITENOISE_AUTOREFRESH=True,
+    CACHALOT_ENABLED=False,
+)
+class AuthenticationBackendTests(TestCase):
+    """Tests for the custom authentication backends"""
+
+    def setUp(self):
+        """Set up test data"""
+        self.user = get_user_model().objects.create_user(
+            email="testuser@test.com", password="testpass123"
+        )
+
+    def test_request_user_is_loaded_with_settings(self):
+        """Test the request user and its settings are fetched in a single query"""
+        self.client.force_login(self.user)
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get("/")
+
+        self.assertEqual(response.status_code, 302)
+        user_queries = [
+            query["sql"]
+            for query in queries.captured_queries
+            if 'FROM "users_user"' in query["sql"]
+        ]
+        self.assertEqual(len(user_queries), 1)
+        self.assertIn('JOIN "users_usersettings"', user_queries[0])
+        self.assertFalse(
+            any(
+                'FROM "users_usersettings"' in query["sql"]
+                for query in queries.captured_queries
+            )
+        )
+
+    def test_allauth_backend_is_used_for_social_logins(self):
+        """Test allauth still recognises its backend when logging users in"""
+        self.assertTrue(
+            any(
+                isinstance(backend, AllauthAuthenticationBackend)
+                for backend in get_backends()
+            )
+        )
+
+        request = RequestFactory().get("/")
+        SessionMiddleware(lambda r: None).process_request(request)
+
+        get_adapter(request).login(request, self.user)
+
+        self.assertEqual(
+            request.session[BACKEND_SESSION_KEY],
+            "apps.users.backends.AuthenticationBackend",
+        )
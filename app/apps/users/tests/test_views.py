@@ -0,0 +1,234 @@
+from django.contrib.auth import get_user_model
+from django.test import TestCase, override_settings
+
+OIDC_PROVIDERS = {
+    "openid_connect": {
+        "APPS": [
+            {
+                "provider_id": "test-idp",
+                "name": "Test IdP",
+                "client_id": "client-id",
+                "secret": "client-secret",
+                "settings": {"server_url": "https://idp.example.com"},
+            }
+        ]
+    }
+}
+
+TWO_OIDC_PROVIDERS = {
+    "openid_connect": {
+        "APPS": [
+            *OIDC_PROVIDERS["openid_connect"]["APPS"],
+            {
+                "provider_id": "second-idp",
+                "name": "Second IdP",
+                "client_id": "second-client-id",
+                "secret": "second-client-secret",
+                "settings": {"server_url": "https://idp2.example.com"},
+            },
+        ]
+    }
+}
+
+
+@override_settings(
+    STORAGES={
+        "default": {"BACKEND": "django.core.files.storage.FileSystemStorage"},
+        "staticfiles": {"BACKEND": "django.contrib.staticfiles.storage.StaticFilesStorage"},
+    },
+    WHITENOISE_AUTOREFRESH=True,
+)
+class UserLoginViewTests(TestCase):
+    """Tests for the OIDC_ONLY redirect in UserLoginView"""
+
+    @override_settings(OIDC_ONLY=False, SOCIALACCOUNT_PROVIDERS=OIDC_PROVIDERS)
+    def test_renders_form_when_oidc_only_disabled(self):
+        """Test the local login form is shown when OIDC_ONLY is off"""
+        response = self.client.get("/login/")
+        self.assertEqual(response.status_code, 200)
+        self.assertIn("form", response.context)
+
+    @override_settings(OIDC_ONLY=True, SOCIALACCOUNT_PROVIDERS=OIDC_PROVIDERS)
+    def test_redirects_to_provider_on_get_and_post(self):
+        """Test both GET and POST are sent to the single OIDC provider"""
+        for method in (self.client.get, self.client.post):
+            response = method("/login/")
+            self.assertRedirects(
+                response,
+                "/auth/oidc/test-idp/login/",
+                fetch_redirect_response=False,
+            )
+
+    @override_settings(OIDC_ONLY=True, SOCIALACCOUNT_PROVIDERS=OIDC_PROVIDERS)
+    def test_redirect_preserves_next(self):
+        """Test the next parameter is forwarded to the provider login URL"""
+        response = self.client.get("/login/?next=/transactions/all/")
+        self.assertRedirects(
+            response,
+            "/auth/oidc/test-idp/login/?next=%2Ftransactions%2Fall%2F",
+            fetch_redirect_response=False,
+        )
+
+    @override_settings(OIDC_ONLY=True, SOCIALACCOUNT_PROVIDERS=OIDC_PROVIDERS)
+    def test_authenticated_user_is_not_sent_to_provider(self):
+        """Test logged in users get the regular redirect instead of the IdP"""
+        user = get_user_model().objects.create_user(
+            email="testuser@test.com", password="testpass123"
+        )
+        self.client.force_login(user)
+
+        response = self.client.get("/login/")
+        self.assertRedirects(response, "/", fetch_redirect_response=False)
+
+    @override_settings(OIDC_ONLY=True, SOCIALACCOUNT_PROVIDERS=TWO_OIDC_PROVIDERS)
+    def test_several_providers_hide_form_and_refuse_credentials(self):
+        """Test local login is unavailable when choosing between providers"""
+        get_user_model().objects.create_user(
+            email="testuser@test.com", password="testpass123"
+        )
+
+        response = self.client.get("/login/")
+        self.assertEqual(response.status_code, 200)
+        self.assertNotContains(response, 'name="password"')
+        self.assertContains(response, "Second IdP")
+
+        response = self.client.post(
+            "/login/", {"username": "testuser@test.com", "password": "testpass123"}
+        )
+        self.assertEqual(response.status_code, 403)
+        self.assertNotIn("_auth_user_id", self.client.session)
+
+
+@override_settings(
+    STORAGES={
+        "default": {"BACKEND": "django.core.files.storage.FileSystemStorage"},
+        "staticfiles": {"BACKEND": "django.contrib.staticfiles.storage.StaticFilesStorage"},
+    },
+    WHITENOISE_AUTOREFRESH=True,
+    DEMO=False,
+)
+class UserEditViewTests(TestCase):
+    """Tests for the user_edit view"""
+
+    def setUp(self):
+        """Set up test data"""
+        User = get_user_model()
+        self.user = User.objects.create_user(
+            email="testuser@test.com", password="testpass123", first_name="Test"
+        )
+        self.other_user = User.objects.create_user(
+            email="other@test.com", password="testpass123"
+        )
+        self.superuser = User.objects.create_superuser(
+            email="admin@test.com", password="testpass123"
+        )
+
+    def test_self_edit(self):
+        """Test users can edit their own account"""
+        self.client.force_login(self.user)
+
+        response = self.client.get(
+            f"/user/{self.user.id}/edit/", HTTP_HX_REQUEST="true"
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.context["form"].instance.pk, self.user.pk)
+
+        response = self.client.post(
+            f"/user/{self.user.id}/edit/",
+            {"first_name": "Updated", "last_name": "", "email": self.user.email},
+            HTTP_HX_REQUEST="true",
+        )
+        self.assertEqual(response.status_code, 204)
+        self.user.refresh_from_db()
+        self.assertEqual(self.user.first_name, "Updated")
+
+    def test_invalid_self_edit_does_not_touch_request_user(self):
+        """Test an invalid POST doesn't leak submitted values onto request.user"""
+        self.client.force_login(self.user)
+
+        response = self.client.post(
+            f"/user/{self.user.id}/edit/",
+            {
+                "first_name": "Changed",
+                "last_name": "",
+                "email": self.user.email,
+                "new_password1": "mismatch-one",
+                "new_password2": "mismatch-two",
+            },
+            HTTP_HX_REQUEST="true",
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.context["request"].user.first_name, "Test")
+
+    def test_superuser_edits_other_user(self):
+        """Test superusers can edit other accounts"""
+        self.client.force_login(self.superuser)
+
+        response = self.client.get(
+            f"/user/{self.other_user.id}/edit/", HTTP_HX_REQUEST="true"
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.context["form"].instance.pk, self.other_user.pk)
+
+    def test_non_superuser_cannot_edit_other_user(self):
+        """Test regular users get a 403 when editing someone else"""
+        self.client.force_login(self.user)
+
+        response = self.client.get(
+            f"/user/{self.other_user.id}/edit/", HTTP_HX_REQUEST="true"
+        )
+        self.assertEqual(response.status_code, 403)
+
+
+@override_settings(
+    STORAGES={
+        "default": {"BACKEND": "django.core.files.storage.FileSystemStorage"},
+        "staticfiles": {"BACKEND": "django.contrib.staticfiles.storage.StaticFilesStorage"},
+    },
+    WHITENOISE_AUTOREFRESH=True,
+)
+class UserSettingsToggleViewTests(TestCase):
+    """Tests for the toggle_amount_visibility and toggle_sound_playing views"""
+
+    def setUp(self):
+        """Set up test data"""
+        self.user = get_user_model().objects.create_user(
+            email="testuser@test.com", password="testpass123"
+        )
+        self.client.force_login(self.user)
+
+    def test_toggle_amount_visibility_twice(self):
+        """Test each toggle flips the stored flag and renders the matching button"""
+        response = self.client.get(
+            "/user/toggle-amount-visibility/", HTTP_HX_REQUEST="true"
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertTemplateUsed(response, "users/generic/show_amounts.html")
+        self.user.settings.refresh_from_db()
+        self.assertTrue(self.user.settings.hide_amounts)
+
+        response = self.client.get(
+            "/user/toggle-amount-visibility/", HTTP_HX_REQUEST="true"
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertTemplateUsed(response, "users/generic/hide_amounts.html")
+        self.user.settings.refresh_from_db()
+        self.assertFalse(self.user.settings.hide_amounts)
+
+    def test_toggle_sound_playing_twice(self):
+        """Test each toggle flips the stored flag and renders the matching button"""
+        response = self.client.get(
+            "/user/toggle-sound-playing/", HTTP_HX_REQUEST="true"
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertTemplateUsed(response, "users/generic/play_sounds.html")
+        self.user.settings.refresh_from_db()
+        self.assertTrue(self.user.settings.mute_sounds)
+
+        response = self.client.get(
+            "/user/toggle-sound-playing/", HTTP_HX_REQUEST="true"
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertTemplateUsed(response, "users/generic/mute_sounds.html")
+        self.user.settings.refresh_from_db()
+        self.assertFalse(self.user.settings.mute_sounds)
@@ -1,3 +1,7 @@
+import copy
+from functools import cache
+from urllib.parse import urlencode
+
 from apps.common.decorators.demo import disabled_on_demo
 from apps.common.decorators.htmx import only_htmx
 from apps.common.decorators.user import htmx_login_required, is_superuser
@@ -8,6 +12,7 @@ from apps.users.forms import (
     UserUpdateForm,
 )
 from apps.users.models import UserSettings
+from django.conf import settings
 from django.contrib import messages
 from django.contrib.auth import get_user_model, logout
 from django.contrib.auth.decorators import login_required
@@ -15,36 +20,47 @@ from django.contrib.auth.views import (
     LoginView,
 )
 from django.core.exceptions import PermissionDenied
-from django.http import HttpResponse
-from django.shortcuts import get_object_or_404, redirect, render
-from django.urls import reverse
+from django.db.models import F
+from django.http import HttpResponse, HttpResponseRedirect
+from django.shortcuts import get_object_or_404, render, resolve_url
+from django.urls import get_script_prefix, reverse
 from django.utils.translation import gettext_lazy as _
 from django.views.decorators.http import require_http_methods
 
+# Keyed by the raw values stored in UserSettings.start_page
+_START_PAGE_ROUTES = {
+    UserSettings.StartPage.MONTHLY.value: "monthly_index",
+    UserSettings.StartPage.YEARLY_ACCOUNT.value: "yearly_index_account",
+    UserSettings.StartPage.YEARLY_CURRENCY.value: "yearly_index_currency",
+    UserSettings.StartPage.NETWORTH_CURRENT.value: "net_worth_current",
+    UserSettings.StartPage.NETWORTH_PROJECTED.value: "net_worth_projected",
+    UserSettings.StartPage.ALL_TRANSACTIONS.value: "transactions_all_index",
+    UserSettings.StartPage.CALENDAR.value: "calendar_index",
+}
+_SIDEBAR_NEXT = {"floating": "fixed", "fixed": "floating"}
+_THEME_NEXT = {"wygiwyh_dark": "wygiwyh_light", "wygiwyh_light": "wygiwyh_dark"}
+
+
+@cache
+def _resolve_start_page_url(start_page, script_prefix):
+    # reverse() prepends the current script prefix, so it is part of the cache key.
+    # Assumes ROOT_URLCONF doesn't change while the process is running.
+    return reverse(_START_PAGE_ROUTES.get(start_page, "monthly_index"))
+
+
+def _start_page_url(start_page):
+    return _resolve_start_page_url(start_page, get_script_prefix())
+
 
 def logout_view(request):
     logout(request)
-    return redirect(reverse("login"))
+    return HttpResponseRedirect(resolve_url(settings.LOGOUT_REDIRECT_URL))
 
 
 @htmx_login_required
 def index(request):
-    if request.user.settings.start_page == UserSettings.StartPage.MONTHLY:
-        return redirect(reverse("monthly_index"))
-    elif request.user.settings.start_page == UserSettings.StartPage.YEARLY_ACCOUNT:
-        return redirect(reverse("yearly_index_account"))
-    elif request.user.settings.start_page == UserSettings.StartPage.YEARLY_CURRENCY:
-        return redirect(reverse("yearly_index_currency"))
-    elif request.user.settings.start_page == UserSettings.StartPage.NETWORTH_CURRENT:
-        return redirect(reverse("net_worth_current"))
-    elif request.user.settings.start_page == UserSettings.StartPage.NETWORTH_PROJECTED:
-        return redirect(reverse("net_worth_projected"))
-    elif request.user.settings.start_page == UserSettings.StartPage.ALL_TRANSACTIONS:
-        return redirect(reverse("transactions_all_index"))
-    elif request.user.settings.start_page == UserSettings.StartPage.CALENDAR:
-        return redirect(reverse("calendar_index"))
-    else:
-        return redirect(reverse("monthly_index"))
+    start_page = request.user.settings.start_page
+    return HttpResponseRedirect(_start_page_url(start_page))
 
 
 class UserLoginView(LoginView):
@@ -52,16 +68,43 @@ class UserLoginView(LoginView):
     template_name = "users/login.html"
     redirect_authenticated_user = True
 
+    def dispatch(self, request, *args, **kwargs):
+        oidc_apps = settings.SOCIALACCOUNT_PROVIDERS["openid_connect"]["APPS"]
+
+        if settings.OIDC_ONLY and oidc_apps and not request.user.is_authenticated:
+            if len(oidc_apps) == 1:
+                # Only one way to log in, so skip the login page altogether
+                url = reverse(
+                    "openid_connect_login",
+                    kwargs={"provider_id": oidc_apps[0]["provider_id"]},
+                )
+                # Forward "next" like {% provider_login_url %} does; allauth validates it
+                next_url = request.POST.get(
+                    self.redirect_field_name, request.GET.get(self.redirect_field_name)
+                )
+                if next_url:
+                    url = f"{url}?{urlencode({self.redirect_field_name: next_url})}"
+                return HttpResponseRedirect(url)
+
+            # Several providers: the template only shows their buttons, and local
+            # credentials are refused
+            if request.method == "POST":
+                raise PermissionDenied
+
+        return super().dispatch(request, *args, **kwargs)
+
 
 @only_htmx
 @htmx_login_required
 def toggle_amount_visibility(request):
-    user_settings, created = UserSettings.objects.get_or_create(user=request.user)
-    current_hide_amounts = user_settings.hide_amounts
-    new_hide_amounts = not current_hide_amounts
+    user_settings = request.user.settings
+    new_hide_amounts = not user_settings.hide_amounts
 
+    # Flip the flag with a single UPDATE and keep the loaded instance in sync
+    UserSettings.objects.filter(user=request.user).update(
+        hide_amounts=~F("hide_amounts")
+    )
     user_settings.hide_amounts = new_hide_amounts
-    user_settings.save()
 
     if new_hide_amounts is True:
         messages.info(request, _("Transaction amounts are now hidden"))
@@ -77,12 +120,14 @@ def toggle_amount_visibility(request):
 @only_htmx
 @htmx_login_required
 def toggle_sound_playing(request):
-    user_settings, created = UserSettings.objects.get_or_create(user=request.user)
-    current_mute_sounds = user_settings.mute_sounds
-    new_mute_sounds = not current_mute_sounds
+    user_settings = request.user.settings
+    new_mute_sounds = not user_settings.mute_sounds
 
+    # Flip the flag with a single UPDATE and keep the loaded instance in sync
+    UserSettings.objects.filter(user=request.user).update(
+        mute_sounds=~F("mute_sounds")
+    )
     user_settings.mute_sounds = new_mute_sounds
-    user_settings.save()
 
     if new_mute_sounds is True:
         messages.info(request, _("Sounds are now muted"))
@@ -119,15 +164,9 @@ def update_settings(request):
 @htmx_login_required
 @require_http_methods(["GET"])
 def toggle_sidebar_status(request):
-    if not request.session.get("sidebar_status"):
-        request.session["sidebar_status"] = "floating"
-
-    if request.session["sidebar_status"] == "floating":
-        request.session["sidebar_status"] = "fixed"
-    elif request.session["sidebar_status"] == "fixed":
-        request.session["sidebar_status"] = "floating"
-    else:
-        request.session["sidebar_status"] = "fixed"
+    request.session["sidebar_status"] = _SIDEBAR_NEXT.get(
+        request.session.get("sidebar_status"), "fixed"
+    )
 
     return HttpResponse(
         status=204,
@@ -137,15 +176,9 @@ def toggle_sidebar_status(request):
 @htmx_login_required
 @require_http_methods(["GET"])
 def toggle_theme(request):
-    if not request.session.get("theme"):
-        request.session["theme"] = "wygiwyh_dark"
-
-    if request.session["theme"] == "wygiwyh_dark":
-        request.session["theme"] = "wygiwyh_light"
-    elif request.session["theme"] == "wygiwyh_light":
-        request.session["theme"] = "wygiwyh_dark"
-    else:
-        request.session["theme"] = "wygiwyh_light"
+    request.session["theme"] = _THEME_NEXT.get(
+        request.session.get("theme"), "wygiwyh_light"
+    )
 
     return HttpResponse(
         status=204,
@@ -167,7 +200,14 @@ def users_index(request):
 @is_superuser
 @require_http_methods(["GET"])
 def users_list(request):
-    users = get_user_model().objects.all().order_by("id")
+    # Only load the columns the list template renders
+    users = (
+        get_user_model()
+        .objects.only(
+            "id", "first_name", "last_name", "email", "is_active", "is_superuser"
+        )
+        .order_by("id")
+    )
 
     return render(
         request,
@@ -208,10 +248,15 @@ def user_add(request):
 @disabled_on_demo
 @require_http_methods(["GET", "POST"])
 def user_edit(request, pk):
-    user = get_object_or_404(get_user_model(), id=pk)
+    if pk == request.user.pk:
+        # Users editing themselves are the common case and are already loaded.
+        # Bind the form to a copy so an invalid POST can't alter request.user
+        user = copy.copy(request.user)
+    else:
+        user = get_object_or_404(get_user_model(), id=pk)
 
-    if not request.user.is_superuser and user != request.user:
-        raise PermissionDenied
+        if not request.user.is_superuser:
+            raise PermissionDenied
 
     if request.method == "POST":
         form = UserUpdateForm(request.POST, instance=user)